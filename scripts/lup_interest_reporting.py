@@ -8,22 +8,42 @@ import os
 import logging
 import arcpy
 import pandas as pd
+import numpy as np
 import warnings
 import openpyxl
 import re
+import string
 import traceback
+import gc
+import multiprocessing
 
 from copy import copy
+from openpyxl.cell import WriteOnlyCell, Cell
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.worksheet.dimensions import ColumnDimension
 from openpyxl.styles import Border, Side, PatternFill, Font, Alignment, NamedStyle
 from openpyxl.utils import get_column_letter
 from argparse import ArgumentParser
-from collections import defaultdict
+from logging.handlers import BufferingHandler
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
-from util.environment import Environment
+# Compiled patterns for parsing the range values of the schema; low value-high value ranges and comparison operators
+range_regex = re.compile(r'(-?\d+\.?\d*)-(-?\d+\.?\d*)')
+operator_regex = re.compile(r'<=|>=|<|>')
+
+# Translation table that replaces spaces and punctuation with underscores when building dataset and field names
+name_table = str.maketrans({char: '_' for char in string.whitespace + string.punctuation})
+
+# Fields of a join table that are never carried over to the unioned dataset
+join_skip_fields = frozenset(['OBJECTID', 'SHAPE_AREA', 'SHAPE_LENGTH', 'SHAPE'])
+
+from util.environment import Environment, arc_env
 
 
 def run_app() -> None:
@@ -34,9 +54,9 @@ def run_app() -> None:
     """
 
     # Gather the input parameters and set up the class oject
-    file_num, out_dir, xls, aoi, aoi_fld, leave, logger = get_input_parameters()
+    file_num, out_dir, xls, aoi, aoi_fld, leave, workers, logger = get_input_parameters()
     lup_overlaps = LUP_Overlaps(file_number=file_num, output_dir=out_dir, xls_schema=xls, aoi=aoi, aoi_field=aoi_fld,
-                            leave_areas=leave, logger=logger)
+                            leave_areas=leave, logger=logger, workers=workers)
     
     # Run the class methods needed to perform the overlap assessment
     lup_overlaps.setup_aoi()
@@ -54,7 +74,7 @@ def get_input_parameters() -> tuple:
     get_input_parameters: Uses the argparse library to gather the input parameters and set up the logging object
 
     Returns:
-        tuple: file name/number, output directory, excel schema, area of interest feature layer, area of interest field, leave areas feature layer, directory the script is run from, logger object
+        tuple: file name/number, output directory, excel schema, area of interest feature layer, area of interest field, leave areas feature layer, number of overlay workers, logger object
     """
 
     try:
@@ -70,6 +90,7 @@ def get_input_parameters() -> tuple:
         parser.add_argument('--log_level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], 
                             help='Log level for message output')
         parser.add_argument('--log_dir', help='Path to the log file directory')
+        parser.add_argument('--workers', type=int, default=1, help='Number of processes used to run the dataset overlays')
 
         args = parser.parse_args()
        
@@ -77,7 +98,7 @@ def get_input_parameters() -> tuple:
         # Set up the logger object
         logger = Environment.setup_logger(args)
 
-        return args.file_num, args.out_dir, args.xls, args.aoi, args.aoi_fld, args.leave, logger
+        return args.file_num, args.out_dir, args.xls, args.aoi, args.aoi_fld, args.leave, args.workers, logger
 
     except Exception as e:
         logging.exception(f'Unexpected exception, program terminating: {repr(e)}')
@@ -90,7 +111,7 @@ class LUP_Overlaps:
     Main class object that contains the methods required to complete the cumulative effects framework analysis
     """
     def __init__(self, file_number:str, output_dir:str, xls_schema:str, aoi:str, aoi_field:str, leave_areas:str, 
-                 logger:logging.Logger) -> None:
+                 logger:logging.Logger, workers:int=1) -> None:
         """
         CLASS METHOD
 
@@ -104,6 +125,7 @@ class LUP_Overlaps:
             leave_areas (str): leave areas feature layer
             python_dir (str): directory where the script is run from
             logger (logging.Logger): logger object for messaging
+            workers (int, optional): number of processes used to run the dataset overlays. Defaults to 1.
         """
 
         # Write the parameters into the class variables
@@ -114,9 +136,10 @@ class LUP_Overlaps:
         self.fld_aoi = aoi_field if aoi_field != '#' else None
         self.leave_areas = leave_areas if leave_areas != '#' else None
         self.logger = logger
+        self.workers = max(1, min(workers, os.cpu_count() or 1))
 
         # Set up the lup dictionary for storing the values
-        self.dict_lup_values = defaultdict(lambda: defaultdict(lambda: LU_Value))
+        self.dict_lup_values = {}
 
         # File paths for spatial files, connections and output files
         # self.logger.info('Creating bcgw connection')
@@ -132,7 +155,8 @@ class LUP_Overlaps:
         #     self.logger.error(f'Connection is not active or database is unreachable: {e}')
         #     sys.exit(1)
         
-        self.out_gdb = os.path.join(self.output_dir, f'lup_data_{self.file_number}.gdb')
+        gdb_name = f'lup_data_{self.file_number}.gdb'
+        self.out_gdb = os.path.join(self.output_dir, gdb_name)
         self.temp_gdb = 'memory'
         self.fd_incoming = os.path.join(self.out_gdb, 'incoming')
         self.fd_work = os.path.join(self.out_gdb, 'work')
@@ -140,12 +164,16 @@ class LUP_Overlaps:
         self.fc_aoi = os.path.join(self.fd_incoming, 'aoi')
         self.fc_leave_areas = os.path.join(self.fd_incoming, 'leave_areas')
         self.fc_net_aoi = os.path.join(self.fd_incoming, 'net_aoi')
+        self.fc_net_aoi_dissolve = os.path.join(self.fd_incoming, 'net_aoi_dissolve')
 
 
 
         self.aoi_total = 0
         self.dict_aoi_area = defaultdict(int)
 
+        # Field names of each dataset, listed only the first time the dataset is used
+        self.dict_field_names = {}
+
         self.xls_output = os.path.join(self.output_dir, 
                                       f'LUP_Overview_{self.file_number}_{datetime.strftime(datetime.today(), "%Y%m%d")}.xlsx')
 
@@ -173,14 +201,19 @@ class LUP_Overlaps:
                                 '% of Assessment Unit that Overlaps with AOI', 
                                 '% of AOI that Overlaps with Assessment Unit']
 
+        # Column widths of the summary and aoi sheets, starting from the first column
+        self.summary_widths = [1, 40, 40, 20, 40, 40, 30, 30, 30]
+        self.aoi_widths = [1, 20, 60, 45] + [25] * 8
+
         arcpy.env.overwriteOutput = True
+        # Let the pairwise tools use every core for the overlays run in this process; worker processes start with their own default environment
+        arcpy.env.parallelProcessingFactor = '100%'
         warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
         # Set up the output geodatabase in the specified output directory
         try:
-            self.logger.info(f'Setting up geodatabase {os.path.basename(self.out_gdb)}')
-            arcpy.management.CreateFileGDB(out_folder_path=os.path.dirname(self.out_gdb), 
-                                           out_name=os.path.basename(self.out_gdb))
+            self.logger.info(f'Setting up geodatabase {gdb_name}')
+            arcpy.management.CreateFileGDB(out_folder_path=self.output_dir, out_name=gdb_name)
         except:
             pass
 
@@ -189,15 +222,15 @@ class LUP_Overlaps:
         if arcpy.Exists(self.fd_incoming):
             arcpy.management.Delete(in_data=self.fd_incoming)
         try:
-            arcpy.management.CreateFeatureDataset(out_dataset_path=os.path.dirname(self.fd_incoming), 
-                                                  out_name=os.path.basename(self.fd_incoming), spatial_reference=3005)
+            arcpy.management.CreateFeatureDataset(out_dataset_path=self.out_gdb, out_name='incoming', 
+                                                  spatial_reference=3005)
         except:
             pass
         if arcpy.Exists(self.fd_work):
             arcpy.management.Delete(in_data=self.fd_work)
         try:
-            arcpy.management.CreateFeatureDataset(out_dataset_path=os.path.dirname(self.fd_work), 
-                                                  out_name=os.path.basename(self.fd_work), spatial_reference=3005)
+            arcpy.management.CreateFeatureDataset(out_dataset_path=self.out_gdb, out_name='work', 
+                                                  spatial_reference=3005)
         except:
             pass
 
@@ -217,31 +250,52 @@ class LUP_Overlaps:
         # Read in the schema values from the input excel file
         self.logger.info('Reading in lup values from excel schema')
         try:
-            lup_df = pd.read_excel(self.xls_schema, sheet_name='LUP Indicators', engine='openpyxl', skiprows=[1], 
-                                    na_filter=False)
+            # Open the schema once in read only mode for both sheets, streaming the rows rather than loading the whole workbook.  The first row holds the field names and the second row their descriptions
+            wb = openpyxl.load_workbook(filename=self.xls_schema, read_only=True, data_only=True)
+            ws = wb['LUP Indicators']
+            lst_rows = list(ws.iter_rows(values_only=True))
         except:
             self.logger.error('Could not read in the excel schema as it does not contain the LUP Indicators sheet')
             sys.exit()
 
         try:
-            # Loop through each row and gather the lup value information
-            for row in lup_df.itertuples():
-                # Check if any of the required fields are empty, if so, then skip over it
-                if any([not i for i in [row.CATEGORY, row.DATASET_NAME, row.PATH]]):
+            # Rows are read into named tuples of the field names, empty cells are read as empty strings and empty rows are dropped
+            SchemaRow = namedtuple('SchemaRow', [str(fld) for fld in lst_rows[0]], rename=True)
+            lst_lup_rows = [SchemaRow(*['' if val is None else val for val in row]) for row in lst_rows[2:] 
+                            if any(val is not None for val in row)]
+
+            # Check if any of the required fields are empty, if so, then skip over those rows
+            lst_required = []
+            for row in lst_lup_rows:
+                if row.CATEGORY and row.DATASET_NAME and row.PATH:
+                    lst_required.append(row)
+                else:
                     self.logger.warning(f'The value {row.DATASET_NAME} is missing one or more of the required fields; skipping this value')
-                    continue
-                # Check the indicated path object exists, if not it may be a BCGW path
-                if arcpy.Exists(row.PATH):
-                    full_path = row.PATH
+            lst_lup_rows = lst_required
+
+            # Check each unique path once as the same dataset is often used by more than one row. If the path does not exist it may be a BCGW path
+            dict_paths = {}
+            for path in dict.fromkeys(row.PATH for row in lst_lup_rows):
+                if arcpy.Exists(path):
+                    dict_paths[path] = path
+                elif arcpy.Exists(os.path.join(self.bcgw, path)):
+                    dict_paths[path] = os.path.join(self.bcgw, path)
                 else:
-                    # Check if the BGW path exists, if not, then skip using the value in the report
-                    if arcpy.Exists(os.path.join(self.bcgw, row.PATH)):
-                        full_path = os.path.join(self.bcgw, row.PATH)
-                    else:
-                        self.logger.warning(f'!!! Could not find the path specified in the excel: {row.PATH}. Skipping this     value')
-                        continue
+                    dict_paths[path] = None
+
+            # Resolved join table paths, filled in as each join path is first seen
+            dict_join_paths = {}
+
+            # Loop through each row and gather the lup value information
+            dict_ds_index = defaultdict(list) # LU_Value objects of each dataset name, used to find the datasets of the additional fields
+            for row in lst_lup_rows:
+                # If neither the path nor the BCGW path exists, then skip using the value in the report
+                full_path = dict_paths[row.PATH]
+                if not full_path:
+                    self.logger.warning(f'!!! Could not find the path specified in the excel: {row.PATH}. Skipping this     value')
+                    continue
 
-                lst_fields = [f.name for f in arcpy.ListFields(dataset=full_path)]
+                set_fields = self.get_field_names(dataset=full_path)
                 id_fields = str(row.UNIQUE_ID_FIELD).replace(' ','').split(',') if row.UNIQUE_ID_FIELD else []
                 assess_fields = str(row.ASSESSMENT_UNIT_FIELD).replace(' ','').split(',') \
                     if row.ASSESSMENT_UNIT_FIELD else []
@@ -249,7 +303,7 @@ class LUP_Overlaps:
                 fc_fields = id_fields + assess_fields
                 drop_fields = []
                 for fld in fc_fields:
-                    if fld not in lst_fields:
+                    if fld not in set_fields:
                         drop_fields.append(fld)
 
                 drop_fields = list(set(drop_fields))
@@ -263,22 +317,28 @@ class LUP_Overlaps:
                 join_path_type = None
                 join_path = ''
                 if row.JOIN_TABLE_PATH != '':
-                    if arcpy.exists(row.JOIN_TABLE_PATH):
-                        join_path = row.JOIN_TABLE_PATH
-                    else:
-                        # Check if the BCGW path exists, if not, then skip using the value in the report
-                        if arcpy.exists(os.path.join(self.bcgw, row.JOIN_TABLE_PATH)):
-                            join_path = os.path.join(self.bcgw, row.JOIN_TABLE_PATH)
+                    # Only check each join path the first time it is seen
+                    if row.JOIN_TABLE_PATH not in dict_join_paths:
+                        if arcpy.Exists(row.JOIN_TABLE_PATH):
+                            dict_join_paths[row.JOIN_TABLE_PATH] = row.JOIN_TABLE_PATH
+                        # Check if the BCGW path exists
+                        elif arcpy.Exists(os.path.join(self.bcgw, row.JOIN_TABLE_PATH)):
+                            dict_join_paths[row.JOIN_TABLE_PATH] = os.path.join(self.bcgw, row.JOIN_TABLE_PATH)
                         else:
-                            self.logger.warning(f'!!! Could not find data at the path specified in the excel: {row. JOIN_TABLE_PATH}. Skipping this value')
-                            continue
+                            dict_join_paths[row.JOIN_TABLE_PATH] = None
+                    join_path = dict_join_paths[row.JOIN_TABLE_PATH]
+                    # If neither the join path nor the BCGW path exists, then skip using the value in the report
+                    if not join_path:
+                        self.logger.warning(f'!!! Could not find data at the path specified in the excel: {row. JOIN_TABLE_PATH}. Skipping this value')
+                        continue
 
 
                 # Create a CE Value object with the gathered information and add it to the dictionary
                 lup_value = LU_Value(name=row.DATASET_NAME, category=row.CATEGORY, 
                                     path=full_path, id_fields=id_fields, 
                                     assess_fields=assess_fields, sql=row.SQL, source_field=row.SOURCE_FIELD, join_table_path=join_path, join_table_type=join_path_type, join_table_field=row.JOIN_TABLE_FIELD, buffer=row.BUFFER)
-                self.dict_lup_values[row.CATEGORY][row.DATASET_NAME] = lup_value
+                self.dict_lup_values.setdefault(row.CATEGORY, {})[row.DATASET_NAME] = lup_value
+                dict_ds_index[row.DATASET_NAME].append(lup_value)
         except Exception as e:
             # Exit out of the script if there is an error; most likely caused by an incorrect schema file used
             self.logger.error(f'There was an issue with the input schema dataset used.  Ensure all the required fields exist within the excel sheet.  Stack Trace: {repr(e)}')
@@ -287,12 +347,15 @@ class LUP_Overlaps:
         # Read in the values from the additional field schema page. This includes formatting and values used for each indicatory on each specified dataset
         try:
             self.logger.info('Reading in additional field schemas')
-            wb = openpyxl.load_workbook(filename=self.xls_schema)
+            # The cell styles are still available from the read only workbook
             ws = wb['Additional Fields']
         except:
             self.logger.error('Could not read in the excel schema as it does not contain the Additional Fields sheet')
             sys.exit()
 
+        # Names of the unique combinations of cell styles found in the sheet
+        dict_style_names = {}
+
         # Loop through each row of the excel sheet
         for row in ws.iter_rows(min_row=3, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
             # Pull in the row information into a Field Schema object
@@ -313,61 +376,54 @@ class LUP_Overlaps:
 
                 # If the value type specified is a range, then parse the values and place them in the value schema object
                 if fld_schema.value_type == 'Range':
-                    # Pull out the numerical values from the string and place them in a list.  This is used to extract ranges that are indicated using the format low value-high value (eg. 0.5-1.2)
-                    lst_range = re.findall(r'-?\d+\.?\d*--?\d+\.?\d*', cell_value.replace(' ',''))
+                    # Pull out the numerical values from the string.  This is used to extract ranges that are indicated using the format low value-high value (eg. 0.5-1.2)
+                    range_val = cell_value.replace(' ','')
+                    range_match = range_regex.search(range_val)
                     range_operator = None
+                    low_val = None
+                    high_val = None
 
                     # If the extracted values are in fact a range, then place them in applicable variables
-                    if lst_range:
-                        for rng in lst_range:
-                            low_val = rng.split('-')[0]
-                            high_val = rng.split('-')[1]
-                            break
+                    if range_match:
+                        low_val, high_val = range_match.groups()
                     # If it is not a standard range, then search for the comparison operators and parse out appropriately
                     else:
-                        range_val = cell_value.replace(' ','')
-                        if '<=' in range_val:
-                            low_val = None
-                            high_val = range_val.replace('<=','')
-                            range_operator = '<='
-                        elif '>=' in range_val:
-                            low_val = range_val.replace('>=','')
-                            high_val = None
-                            range_operator = '>='
-                        elif '<' in range_val:
-                            low_val = None
-                            high_val = range_val.replace('<','')
-                            range_operator = '<'
-                        elif '>' in range_val:
-                            low_val = range_val.replace('>','')
-                            high_val = None
-                            range_operator = '>'
+                        operator_match = operator_regex.search(range_val)
+                        if operator_match:
+                            range_operator = operator_match.group()
+                            bound_val = range_val.replace(range_operator, '')
+                            low_val, high_val = (None, bound_val) if range_operator in ['<=', '<'] else (bound_val, None)
 
                     # Account for percent values
-                    low_val = None if not low_val else float(low_val) if '%' not in low_val else float(low_val.replace('%',''))/100
-                    high_val = None if not high_val else float(high_val) if '%' not in high_val else float(high_val.replace('%',''))/100
+                    low_val = parse_range_value(low_val) if low_val else None
+                    high_val = parse_range_value(high_val) if high_val else None
 
                     # Add to the cell schema object
                     cell_schema.range_low = low_val
                     cell_schema.range_high = high_val
                     cell_schema.range_operator = range_operator
 
-                # Pull out the cell formatting and place in the cell schema object
-                cell_schema.style_align = copy(row[i].alignment)
-                cell_schema.style_border = copy(row[i].border)
-                cell_schema.style_fill = copy(row[i].fill)
-                cell_schema.style_font = copy(row[i].font)
-                cell_schema.style_format = copy(row[i].number_format)
+                # Pull out the cell formatting and place in the cell schema object.  The read only workbook holds a single object for each unique 
+                # style that all its cells refer to, so these are used as is rather than copied
+                lst_styles = [row[i].alignment, row[i].border, row[i].fill, row[i].font]
+                cell_schema.style_align, cell_schema.style_border, cell_schema.style_fill, cell_schema.style_font = lst_styles
+                cell_schema.style_format = row[i].number_format
+
+                # Cells with the same formatting share a style name so only one named style is created for them in the output
+                style_key = tuple(id(style) for style in lst_styles) + (cell_schema.style_format,)
+                cell_schema.style_name = dict_style_names.setdefault(style_key, f'value style {len(dict_style_names) + 1}')
 
                 # Add the cell schema object to the field schema object
                 fld_schema.dict_values[cell_value] = cell_schema
 
             # Find the appropriate dataset in the lup values dictionary and add in the field schema object
-            for lup in self.dict_lup_values:
-                for ds in self.dict_lup_values[lup]:
-                    if ds ==  ds_name:
-                        self.dict_lup_values[lup][ds].other_fields_schema[fld_schema.name] = fld_schema
+            for lup_value in dict_ds_index.get(ds_name, []):
+                lup_value.other_fields_schema[fld_schema.name] = fld_schema
+
+        # Close the schema workbook and release it along with the schema rows now everything has been read in
         wb.close()
+        del wb, ws, lst_rows, lst_lup_rows
+        gc.collect()
 
     def __del__(self):
 
@@ -377,21 +433,34 @@ class LUP_Overlaps:
 
         
 
+    def get_field_names(self, dataset: str) -> set:
+        """
+        CLASS METHOD
+
+        get_field_names: Returns the field names of a dataset, only listing the fields the first time the dataset is seen
+
+        Args:
+            dataset (str): path to the dataset
+
+        Returns:
+            set: field names of the dataset
+        """
+        if dataset not in self.dict_field_names:
+            self.dict_field_names[dataset] = {f.name for f in arcpy.ListFields(dataset=dataset)}
+        return self.dict_field_names[dataset]
+
     def setup_aoi(self) -> None:
         """
         CLASS METHOD
 
         setup_aoi: Sets up the area of interest datset and removes any leave areas if required
         """
-        # Add in the total area field and calcualte the area in hectares for each feature
+        # Calcualte the area in hectares for each feature, the total area field is added by the tool if it does not exist
         self.logger.info('Determining aoi area in hectares')
-        arcpy.management.AddField(in_table=self.fc_aoi, field_name=self.fld_area, field_type='DOUBLE')
-        with arcpy.da.UpdateCursor(in_table=self.fc_aoi, field_names=[self.fld_area, 'SHAPE@AREA']) as u_cursor:
-            for row in u_cursor:
-                row[0] = row[1]/10000
-                u_cursor.updateRow(row)
+        arcpy.management.CalculateGeometryAttributes(in_features=self.fc_aoi, geometry_property=[[self.fld_area, 'AREA']], 
+                                                     area_unit='HECTARES')
 
-        # If the leave areas exist, then erase them out of the area of interest.  Uses the union tool as the Erase requires an Advanced licence
+        # If the leave areas exist, then erase them out of the area of interest.  Uses the pairwise erase so only the net aoi is written out rather than every union sliver
         if arcpy.Exists(self.fc_leave_areas):
 
             self.logger.info('Removing leave areas')
@@ -402,16 +471,30 @@ class LUP_Overlaps:
             # Copy the aoi if no leave areas were specified
             arcpy.management.CopyFeatures(in_features=self.fc_aoi, out_feature_class=self.fc_net_aoi)
 
-        # Loop through the net aoi dataset and add the total areas to a dictionary for later use
+        # Dissolve the net aoi into a single feature, the datasets are selected against this rather than each aoi feature
+        arcpy.analysis.PairwiseDissolve(in_features=self.fc_net_aoi, out_feature_class=self.fc_net_aoi_dissolve, 
+                                        multi_part='MULTI_PART')
+
+        # Read the net aoi dataset in one pass and add the total areas to a dictionary for later use
         lst_fields = ['SHAPE@AREA']
         if self.fld_aoi:
             lst_fields.append(self.fld_aoi)
         with arcpy.da.SearchCursor(in_table=self.fc_net_aoi, field_names=lst_fields) as s_cursor:
-            for row in s_cursor:
-                self.aoi_total += row[0] / 10000
-                self.dict_aoi_area[self.str_overall] += row[0] / 10000
-                if self.fld_aoi:
-                    self.dict_aoi_area[row[1]] += row[0] / 10000
+            aoi_df = pd.DataFrame(list(s_cursor), columns=lst_fields, dtype=object)
+        aoi_df['SHAPE@AREA'] = aoi_df['SHAPE@AREA'].astype(float) / 10000
+        aoi_area = float(aoi_df['SHAPE@AREA'].sum())
+        self.aoi_total += aoi_area
+        self.dict_aoi_area[self.str_overall] += aoi_area
+        if self.fld_aoi:
+            # Total the areas of each aoi name with the features without a name as their own group under None, as the cursor 
+            # returned them.  The nullable types keep integer names from being turned into decimals by a null
+            aoi_names = aoi_df[self.fld_aoi].convert_dtypes()
+            aoi_sums = aoi_df.groupby(aoi_names, sort=False, dropna=False)['SHAPE@AREA'].sum()
+            for aoi, area in zip(aoi_sums.index.tolist(), aoi_sums.tolist()):
+                self.dict_aoi_area[None if pd.isna(aoi) else aoi] += area
+            null_count = int(aoi_names.isna().sum())
+            if null_count:
+                self.logger.warning(f'{null_count} aoi feature(s) do not have a value in {self.fld_aoi}, their area is reported under None')
 
 
     # def fetch_oracle_geodata(self, connection, table, id_flds, aoi_gdf, sql_filter=None, logger=None):
@@ -541,237 +624,79 @@ class LUP_Overlaps:
         """
         CLASS METHOD
 
-        overlay_values: Main function that performs the overlays between the aoi and the lup values, then stores the results in the dictionary
+        overlay_values: Main function that performs the overlays between the aoi and the lup values, then stores the results in the dictionary.  When more than one worker is requested the datasets are processed in parallel
         """
         # arcpy.env.extent = self.fc_net_aoi
 
-        fld_id_aoi = f'FID_net_aoi'
-        # self.logger.info(self.gdf_net_aoi.columns)
-        aoi_geom = None
-        with arcpy.da.SearchCursor(self.fc_net_aoi, ['SHAPE@']) as s_cursor:
-            for row in s_cursor:
-                if aoi_geom:
-                    aoi_geom = aoi_geom.union(row[0])
-                else:
-                    aoi_geom = row[0]
-            # fs = FeatureSet(aoi_geom)
-
-        # aoi_geometry = fs.geometries[0]
-
-        # aoi_sedf = pd.DataFrame.spatial.from_featureclass(self.fc_net_aoi)
-        # aoi_geom = None
-        # # Get a list of all geometry objects from the GeoDataFrame
-        # geometry_list = aoi_gdf['SHAPE'].tolist()
-
-        # # Start with the first geometry as the base
-        # unioned_geometry = geometry_list[0]
-
-        # # If there are more geometries, loop through the rest and union them
-        # if len(geometry_list) > 1:
-        #     for geom in geometry_list[1:]:
-        #         unioned_geometry = unioned_geometry.union(geom)
-
-        # # aoi_geom = unioned_geometry
-        # aoi_geom = Geometry(unioned_geometry.JSON)
-        aoi_lyr = arcpy.management.MakeFeatureLayer(in_features=self.fc_net_aoi, out_layer='aoi_lyr')
+        dict_params = {'aoi_fc': self.fc_net_aoi, 'work_path': self.fd_work, 'out_gdb': self.out_gdb, 
+                       'temp_gdb': self.temp_gdb, 'aoi_field': self.fld_aoi, 'str_overall': self.str_overall, 
+                       'select_fc': self.fc_net_aoi_dissolve}
+        lst_tasks = [(lup, ds) for lup in self.dict_lup_values for ds in self.dict_lup_values[lup]]
+
+        if self.workers > 1 and len(lst_tasks) > 1:
+            self.logger.info(f'Running overlays using {self.workers} workers')
+            # Spawned workers need the python interpreter rather than ArcGIS Pro when run from within a toolbox
+            mp_context = multiprocessing.get_context('spawn')
+            if arc_env:
+                mp_context.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+            try:
+                with ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context) as executor:
+                    try:
+                        dict_futures = {executor.submit(process_lup_ds_worker, self.dict_lup_values[lup][ds], 
+                                                        dict_params): (lup, ds) for lup, ds in lst_tasks}
+                        for future in as_completed(dict_futures):
+                            lup, ds = dict_futures[future]
+                            try:
+                                lup_ds, lst_records = future.result()
+                            except BrokenProcessPool:
+                                raise
+                            except Exception as e:
+                                # An error with the dataset itself; leave it in the task list so it is run again in this process
+                                self.logger.warning(f'Overlay of {ds} failed in a worker, running it again in this process: {repr(e)}')
+                                continue
+                            for level, msg in lst_records:
+                                self.logger.log(level, msg)
+                            self.dict_lup_values[lup][ds] = lup_ds
+                            lst_tasks.remove((lup, ds))
+                    except BrokenProcessPool as e:
+                        # Licensing or workspace issues took down the workers; drop the queued datasets and finish them in this process
+                        self.logger.warning(f'Parallel overlays could not be completed, running the remaining datasets sequentially: {repr(e)}')
+                        executor.shutdown(wait=True, cancel_futures=True)
+            finally:
+                # Move the worker outputs into the output geodatabase so a parallel run leaves the same datasets as a sequential one
+                self.collect_worker_outputs()
+
+        # Describe the aoi once for all the datasets run in this process
+        aoi_extent = arcpy.Describe(self.fc_net_aoi).extent if lst_tasks else None
         # Loop through the lup values extracted from the input excel schema file
-        for lup in self.dict_lup_values:
-            # Loop through the datasets for each lup value
-            for ds in self.dict_lup_values[lup]:
-
-                self.logger.info(f'Running overlay on {ds}')
-                lup_ds = self.dict_lup_values[lup][ds]
-                in_fc = lup_ds.path
-                join_fc = lup_ds.join_path
-                buffer = lup_ds.buffer
-                sql = lup_ds.sql
-                id_flds = ','.join(lup_ds.id_fields)
-                if not lup_ds.id_fields:
-                    id_flds = 'OBJECTID'
-
-                temp_fc = os.path.join(self.temp_gdb, 'temp_fc')
-                intersect_fc = os.path.join(self.temp_gdb, 'intersect_fc')
-                buffer_fc = os.path.join(self.temp_gdb, 'buffer_fc')
-                erase_fc = os.path.join(self.temp_gdb, 'erase_fc')
-                union_name = f"union_{str(lup_ds.name).lower().replace(' ', '_')}"
-                union_fc = os.path.join(self.fd_work, union_name)
-
-                
-                fc_lyr = arcpy.management.MakeFeatureLayer(in_features=in_fc, out_layer='fc_lyr', where_clause=sql)
-
-                result = int(arcpy.management.GetCount(fc_lyr).getOutput(0))
-                arcpy.management.SelectLayerByLocation(in_layer=fc_lyr, overlap_type='INTERSECT',select_features=aoi_lyr)
-                result = int(arcpy.management.GetCount(fc_lyr).getOutput(0))
-
-                arcpy.management.CopyFeatures(in_features=fc_lyr, out_feature_class=temp_fc)
-                arcpy.management.Delete(in_data=fc_lyr)
-                # arcpy.analysis.Select(in_features=in_fc, out_feature_class=temp_fc, where_clause=sql)
-                # arcpy.conversion.ExportFeatures(in_features=in_fc, out_features=temp_fc, field_mapping=field_mappings,
-                #                                  where_clause=sql)
-
-                result = int(arcpy.management.GetCount(temp_fc).getOutput(0))
-
-                if result == 0:
-                    # arcpy.analysis.Select(in_features=in_fc, out_feature_class=os.path.join(self.fd_work, 'temp_fc'), where_clause=sql)
-                    self.logger.warning('***Dataset does not overlap AOI***')
-                    continue
-
-                fld_id_lu = f"FID_{str(lup_ds.name).lower().replace(' ', '_')}"
-                fld_id_lu = fld_id_lu[:60] if len(fld_id_lu) > 60 else fld_id_lu
-                arcpy.management.AddField(in_table=temp_fc, field_name=fld_id_lu, field_type='LONG')
-
-                lup_id = 1
-                # Use a search cursor with a spatial query to get filtered data
-                with arcpy.da.UpdateCursor(temp_fc, ['SHAPE@', fld_id_lu]) as cursor:
-                    for row in cursor:
-                        if aoi_geom.disjoint(row[0]):
-                            cursor.deleteRow()
-                        else:
-                            row[1] = lup_id
-                            lup_id += 1
-                            cursor.updateRow(row)
-
-                if buffer:
-                    self.logger.info(f'    - buffering by {buffer} metres')
-                    arcpy.analysis.PairwiseBuffer(in_features=temp_fc, out_feature_class=buffer_fc,
-                                                   buffer_distance_or_field=buffer)
-                    arcpy.management.Delete(temp_fc)
-                    temp_fc = buffer_fc
-
-                self.logger.info('    - intersecting with aoi')
-                arcpy.analysis.PairwiseIntersect(in_features=[self.fc_net_aoi, temp_fc], out_feature_class=intersect_fc)
-                self.logger.info('    - erasing aoi')
-                arcpy.analysis.PairwiseErase(in_features=temp_fc, erase_features=self.fc_net_aoi,
-                                              out_feature_class=erase_fc)
-                self.logger.info('    - combining datasets')
-                arcpy.management.Merge(inputs=[intersect_fc, erase_fc], output=union_fc, 
-                                       field_match_mode='USE_FIRST_SCHEMA')
-                
-                for fc in [temp_fc, intersect_fc, erase_fc]:
-                    arcpy.management.Delete(in_data=fc)
-
-                ds_type = arcpy.Describe(union_fc).shapeType
-                self.dict_lup_values[lup][ds].data_type = ds_type
-                    
-
-                # If there is a join tables specifed in the schema for this value then, join it to the unioned dataset
-                if join_fc:
-                    # If the join fields were not specified correctly in the excel schema, then don't perform the join
-                    if not any([lup_ds.source_field, lup_ds.join_field]):
-                        self.logger.warning('The fields required for the table join were not specified in the schema')
-                    else:
-                        self.logger.info(f'Joining {os.path.basename(join_fc)} to dataset')
-                        try:
-                            # Copy the specified table to the geodatabase then join to the unioned dataset
-                            join_tbl = os.path.join(self.out_gdb, f'{os.path.basename(union_fc)}_jointable')
-                            arcpy.management.CopyRows(in_rows=join_fc, out_table=join_tbl)
-                            lst_fields = [fld.name for fld in arcpy.ListFields(join_tbl) if fld.name.upper() not in 
-                                          ['OBJECTID', 'SHAPE_AREA', 'SHAPE_LENGTH', 'SHAPE']]
-                            arcpy.management.JoinField(in_data=union_fc, in_field=lup_ds.source_field, 
-                                                       join_table=join_tbl, join_field=lup_ds.join_field, fields=lst_fields)
-                        except:
-                            self.logger.warning('Something went wrong with the join, could not complete the operation')
-                
-                
-                # Compile the list of fields to search the unioned dataset based on the input schema
-                lst_fields = ['SHAPE@AREA', 'SHAPE@LENGTH', fld_id_aoi, fld_id_lu] + \
-                                (list(set(lup_ds.assessment_fields) - set(lup_ds.id_fields))) + lup_ds.id_fields
-                lst_fields = [fld for fld in lst_fields if fld != 'OBJECTID']
-                lst_additional = []
-                if lup_ds.other_fields_schema:
-                    for fld in lup_ds.other_fields_schema:
-                        lst_additional.extend([fld] + lup_ds.other_fields_schema[fld].other_fields)
-                    lst_fields.extend(lst_additional)
-                if self.fld_aoi:
-                    lst_fields.append(self.fld_aoi)
-
-                lst_intersecting_aus = []
-                # Gather a list of the assessment units that intersect the area of interest
-                with arcpy.da.SearchCursor(in_table=union_fc, field_names=lst_fields, where_clause=lup_ds.sql) as s_cursor:
-                    for row in s_cursor:
-                        fid_aoi = row[lst_fields.index(fld_id_aoi)]
-                        lst_au = []
-                        for fld in lup_ds.id_fields:
-                            if str(row[lst_fields.index(fld)]) not in ['','None']:
-                                lst_au.append(str(row[lst_fields.index(fld)]))
-                        if not lst_au:
-                            continue
-                        au = ' '.join(lst_au)
-                        if row[lst_fields.index(fld_id_aoi)] and row[lst_fields.index(fld_id_aoi)] != -1:
-                            lst_intersecting_aus.append(au)
-                # Flag used to determine if the SQL clause resulted in no records returned
-                bl_no_rows = True
-                # Loop through the records in the unioned resultant and pull out the required attributes
-                with arcpy.da.SearchCursor(in_table=union_fc, field_names=lst_fields, where_clause=lup_ds.sql) as s_cursor:
-                    for row in s_cursor:
+        for lup, ds in lst_tasks:
+            self.dict_lup_values[lup][ds] = process_lup_ds(lup_ds=self.dict_lup_values[lup][ds], logger=self.logger, 
+                                                           aoi_extent=aoi_extent, **dict_params)
 
-                        bl_no_rows = False
-                        shp = row[lst_fields.index('SHAPE@AREA')]/10000 \
-                            if row[lst_fields.index('SHAPE@AREA')] else row[lst_fields.index('SHAPE@LENGTH')]
-                        if ds_type == 'Point':
-                            shp = 1
-                        fid_aoi = row[lst_fields.index(fld_id_aoi)]
-                        fid_lup = row[lst_fields.index(fld_id_lu)]
-                        aoi = None if not self.fld_aoi else row[lst_fields.index(self.fld_aoi)]
-                        lst_au = [] if lup_ds.id_fields else ['All Units']
-                        lst_au_name = [] if lup_ds.assessment_fields else ['All Units']
-
-                        # Create the assessment unit id; takes into account if more than one field was selected
-                        for fld in lup_ds.id_fields:
-                            if str(row[lst_fields.index(fld)]) not in ['', 'None']:
-                                lst_au.append(str(row[lst_fields.index(fld)]))
-                        if not lst_au:
-                            continue
-                        else:
-                            au = ' '.join(lst_au)
 
-                        # Skip the record if the assessment unit is not in the list of intersecting ones
-                        if au not in lst_intersecting_aus and au != 'All Units':
-                            continue
+    def collect_worker_outputs(self) -> None:
+        """
+        CLASS METHOD
 
-                        # Create the assessment unit name; takes into account if more than one field was selected
-                        for fld in lup_ds.assessment_fields:
-                            if str(row[lst_fields.index(fld)]) not in ['', 'None']:
-                                lst_au_name.append(str(row[lst_fields.index(fld)]))
-                            else:
-                                lst_au_name.append('Unnamed')
-
-                        au_name = ' '.join(lst_au_name)
-
-                        # Incrememnt total area of the assessment unit for overall and the aoi if an aoi field wasselected
-                        self.dict_lup_values[lup][ds].aoi[self.str_overall].assessment_units[au].au_name = au_name
-                        self.dict_lup_values[lup][ds].aoi[self.str_overall].assessment_units[au].total_area += shp
-                        if aoi:
-                            self.dict_lup_values[lup][ds].aoi[aoi].assessment_units[au].au_name = au_name
-                            self.dict_lup_values[lup][ds].aoi[aoi].assessment_units[au].total_area += shp
-                            self.dict_lup_values[lup][ds].aoi[aoi].assessment_units[au].total_count += 1
-                        # If the feature is within the area of interest
-                        if fid_aoi and fid_aoi != -1 and not pd.isnull(fid_aoi):
-
-                            # Incrememnt total area of the aoi for overall and the aoi if an aoi field was selected
-                            self.dict_lup_values[lup][ds].aoi[self.str_overall].total_area += shp
-                            self.dict_lup_values[lup][ds].aoi[self.str_overall].total_count += 1
-                            if aoi:
-                                self.dict_lup_values[lup][ds].aoi[aoi].total_area += shp
-                                self.dict_lup_values[lup][ds].aoi[aoi].total_count += 1
-                            # If the feature is within the lup value
-                            if fid_lup != -1 and not pd.isnull(fid_lup):
-                                # Incrememnt area of the aoi within the assessment unit for overall
-                                self.dict_lup_values[lup][ds].aoi[self.str_overall].assessment_units[au].aoi_area += shp
-                                # Loop through the additional fields and add the values to the dictionary for overall
-                                for o_fld in lst_additional:
-                                    self.dict_lup_values[lup][ds].aoi[self.str_overall].assessment_units[au].other_fields[o_fld] = row[lst_fields.index(o_fld)] if row[lst_fields.index(o_fld)]else ''
-                                # If an aoi field was selected, increment the aoi area within the assessment unit
-                                if aoi:
-                                    self.dict_lup_values[lup][ds].aoi[aoi].assessment_units[au].aoi_area += shp
-                                    # Loop through the additional fields and add the values to the dictionary for theaoi
-                                    for o_fld in lst_additional:
-                                        self.dict_lup_values[lup][ds].aoi[aoi].assessment_units[au].other_fields[o_fld] = row[lst_fields.index(o_fld)] if row[lst_fields.index(o_fld)] else ''
-
-
-                # If the flag was not lowered, output warning of no overlap                        
-                if bl_no_rows:
-                    self.logger.warning(f'+++Value does not overlap the area of interest with the SQL clause: {lup_ds.sql}+++')
+        collect_worker_outputs: Copies the unioned datasets and join tables written by the overlay workers into the work feature dataset and output geodatabase, where a sequential run writes them, then deletes the scratch geodatabases of the workers
+        """
+        # Each worker names its scratch geodatabase after this process and its own, so only the ones from this run are collected
+        scratch_prefix = f'lup_work_{os.getpid()}_'
+        lst_scratch_gdbs = [os.path.join(self.output_dir, gdb) for gdb in os.listdir(self.output_dir) 
+                            if gdb.startswith(scratch_prefix) and gdb.endswith('.gdb')]
+        for scratch_gdb in lst_scratch_gdbs:
+            self.logger.info(f'Collecting worker outputs from {os.path.basename(scratch_gdb)}')
+            try:
+                with arcpy.EnvManager(workspace=scratch_gdb):
+                    for fc in arcpy.ListFeatureClasses(wild_card='union_*'):
+                        arcpy.management.CopyFeatures(in_features=os.path.join(scratch_gdb, fc), 
+                                                      out_feature_class=os.path.join(self.fd_work, fc))
+                    for tbl in arcpy.ListTables(wild_card='*_jointable'):
+                        arcpy.management.CopyRows(in_rows=os.path.join(scratch_gdb, tbl), 
+                                                  out_table=os.path.join(self.out_gdb, tbl))
+                arcpy.management.Delete(in_data=scratch_gdb)
+            except Exception as e:
+                self.logger.warning(f'Could not collect the worker outputs from {scratch_gdb}: {repr(e)}')
 
 
     def write_summary(self, ws) -> None:
@@ -831,9 +756,8 @@ class LUP_Overlaps:
 
 
         lup_headers = ['Category', 'Dataset - Type'] + self.summary_headers
-        for header in lup_headers:
-            ws.cell(row=i_row, column=i_col + lup_headers.index(header), 
-                    value=header).style = self.xl_style.column_header
+        for header_index, header in enumerate(lup_headers):
+            ws.cell(row=i_row, column=i_col + header_index, value=header).style = self.xl_style.column_header
         
         i_row += 1
         for lup in self.dict_lup_values:
@@ -867,13 +791,11 @@ class LUP_Overlaps:
                     # i += 1
                     
 
-                    total_shp = 0
-                    aoi_shp = 0
-                    au_count = 0
-                    for au in lup_ds.aoi[aoi].assessment_units:
-                        au_count += 1
-                        total_shp += lup_ds.aoi[self.str_overall].assessment_units[au].total_area
-                        aoi_shp += lup_ds.aoi[aoi].assessment_units[au].aoi_area
+                    # Total the area columns of the assessment units in one pass
+                    aoi_units = lup_ds.get_aoi(aoi=aoi)
+                    au_count = len(aoi_units.au_keys)
+                    total_shp = sum(aoi_units.total_areas.tolist())
+                    aoi_shp = sum(aoi_units.aoi_areas.tolist())
                     if au_count == 0:
                         # If there was no overlap with the aoi, then indicate as such in the sheet and move on to the next  dataset
                         ws.cell(row=i_row, column=i_col + i, 
@@ -895,12 +817,19 @@ class LUP_Overlaps:
                         i += 1
                         ws.cell(row=i_row, column=i_col + i, value=aoi_shp).style = number_style
                         i += 1
-                        ws.cell(row=i_row, column=i_col+i, 
-                                value=f'=${get_column_letter(i_col+3)}${i_row}/${get_column_letter(i_col+2)}${i_row}'). style=percent_style
+                        # The percentages are written as values to match the aoi sheets, a zero area is marked as not applicable 
+                        # rather than shown as a zero percent
+                        if total_shp:
+                            value = aoi_shp / total_shp
+                            style = percent_style
+                        else:
+                            value = 'N/A'
+                            style = self.xl_style.regular_na
+                        ws.cell(row=i_row, column=i_col+i, value=value).style=style
                         i += 1
 
-                        if lup_ds.data_type not in ['Point', 'Polyline']:
-                            value = f'=${get_column_letter(i_col+3)}${i_row}/${get_column_letter(3)}${aoi_row + lst_aois.index(aoi)}'
+                        if lup_ds.data_type not in ['Point', 'Polyline'] and self.dict_aoi_area[aoi]:
+                            value = aoi_shp / self.dict_aoi_area[aoi]
                             style = percent_style
                         else:
                             value = 'N/A'
@@ -914,15 +843,8 @@ class LUP_Overlaps:
         
         i_col = 1
         # Set the column widths
-        ws.column_dimensions[get_column_letter(i_col)].width = 1
-        ws.column_dimensions[get_column_letter(i_col+1)].width = 40
-        ws.column_dimensions[get_column_letter(i_col+2)].width = 40
-        ws.column_dimensions[get_column_letter(i_col+3)].width = 20
-        ws.column_dimensions[get_column_letter(i_col+4)].width = 40
-        ws.column_dimensions[get_column_letter(i_col+5)].width = 40
-        ws.column_dimensions[get_column_letter(i_col+6)].width = 30
-        ws.column_dimensions[get_column_letter(i_col+7)].width = 30
-        ws.column_dimensions[get_column_letter(i_col+8)].width = 30
+        ws.set_column_widths(lst_widths=[(get_column_letter(i_col + col_offset), col_width) 
+                                         for col_offset, col_width in enumerate(self.summary_widths)])
 
 
             
@@ -940,16 +862,8 @@ class LUP_Overlaps:
         if os.path.exists(self.xls_output):
             os.remove(self.xls_output)
 
-        # Copy the schema excel to the new location and remove all sheets but the front page
-        # shutil.copyfile(self.xls_schema, self.xls_output)
-        # wb = openpyxl.load_workbook(self.xls_output)
-        # for sheet in wb.sheetnames:
-        #     if sheet != 'Front Page':
-        #         wb.remove(worksheet=wb[sheet])
-        wb = openpyxl.Workbook()
-        for sheet in wb.sheetnames:
-            if sheet == 'Sheet':
-                wb.remove(worksheet=wb[sheet])
+        # Stream the sheets out to a new workbook in write only mode, it is created without a default sheet. The schema workbook is not copied or reloaded
+        wb = openpyxl.Workbook(write_only=True)
 
         # Set up the standard styles and add to the workbook
         self.xl_style = ExcelStyles(wb=wb)
@@ -959,210 +873,228 @@ class LUP_Overlaps:
         if len(self.dict_aoi_area.keys()) > 1:
             lst_sheets.extend([k for k in self.dict_aoi_area])
 
+        # Bind the names of the styles used for every assessment unit to local names rather than looking them up for each cell.
+        # Assigning a style by name is a lookup of the name, assigning the style object compares it to each registered style
+        style_regular = self.xl_style.regular.name
+        style_regular_na = self.xl_style.regular_na.name
+        style_number = self.xl_style.number.name
+        style_percent = self.xl_style.percent.name
+        style_column_header = self.xl_style.column_header.name
+        style_value_header = self.xl_style.value_header.name
+        style_value_subheader = self.xl_style.value_subheader.name
+        get_value_style = self.xl_style.get_value_style
+        thick_side = self.xl_style.thick_border
+
+        # Build the assessment unit columns of each aoi once, these are shared by the summary and the aoi sheets.
+        # The layout of the lup values and datasets is the same on every aoi sheet so it is also set up once as a plan of 
+        # lup value, last column of the lup value block and the dataset name, object, headers, header count and additional field columns
+        lst_sheet_plan = []
+        for lup in self.dict_lup_values:
+            lst_ds_plan = []
+            num_fields = 0
+            for ds in self.dict_lup_values[lup]:
+                lup_ds = self.dict_lup_values[lup][ds]
+                for aoi in lup_ds.aoi:
+                    lup_ds.aoi[aoi].build_columns(overall=lup_ds.get_aoi(aoi=self.str_overall))
+
+                # The dataset columns start after the lup value and dataset name columns
+                i_col = 4
+                lup_fields = list(lup_ds.other_fields_schema.keys())
+                other_headers = [lup_ds.other_fields_schema[fld].label for fld in lup_ds.other_fields_schema]
+
+                standard_headers = self.standard_point_headers if lup_ds.data_type == 'Point' else \
+                    self.standard_line_headers if lup_ds.data_type == 'Polyline' else self.standard_poly_headers
+                lup_headers = [standard_headers[0]] + other_headers + standard_headers[1:]
+                add_index = i_col + len(lup_fields)
+
+                # Field, schema, column and other fields of each additional field; these follow the assessment unit name column in schema order
+                lst_field_plan = [(ce_fld, lup_ds.other_fields_schema[ce_fld], i_col + 1 + fld_index, 
+                                   tuple(lup_ds.other_fields_schema[ce_fld].other_fields)) 
+                                  for fld_index, ce_fld in enumerate(lup_fields)]
+
+                lst_ds_plan.append((ds, lup_ds, lup_headers, len(lup_headers), add_index, lst_field_plan))
+                num_fields = max(num_fields, len(lup_fields))
+
+            lst_sheet_plan.append((lup, 2 + len(self.standard_poly_headers) + num_fields + 1, lst_ds_plan))
+
+        # The title and column widths are the same on every aoi sheet
+        title_text = f'Landuse Plan Analysis - {os.path.basename(self.aoi)}'
+        lst_aoi_widths = [(get_column_letter(col_index), col_width) for col_index, col_width in 
+                          enumerate(self.aoi_widths, start=1)]
         try:
         # Loop through the list of sheets to create
             for sheet in lst_sheets:
 
                 # Add a new sheet with the specified name and set the worksheet opject to point to it
                 self.logger.info(f'Writing sheet - {sheet}')
-                wb.create_sheet(title=str(sheet))
-                ws = wb[str(sheet)]
+                ws = WorksheetBuffer(wb=wb, title=str(sheet))
+                ws_cell = ws.cell
 
                 if sheet == self.str_summary:
                     self.write_summary(ws=ws)
+                    ws.flush()
                     continue
 
+                # Set the column widths; these need to be set before any rows are streamed to the sheet
+                ws.set_column_widths(lst_widths=lst_aoi_widths)
+
                 # Row and column index objects
                 i_row = 1
                 i_col = 2
 
                 # Write the standardized title information to the top of the sheet
                 self.logger.info('Setting up title information')
-                title_text = f'Landuse Plan Analysis - {os.path.basename(self.aoi)}'
                 ws.cell(row=i_row, column=i_col, value=title_text).style = self.xl_style.title
                 ws.merge_cells(start_row=i_row, start_column=i_col, end_row=i_row, end_column=i_col + 5)
                 i_row +=1
-                ws.cell(row=i_row, column=i_col, value='File Name/Number:').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col, value='File Name/Number:').style = style_regular
 
-                ws.cell(row=i_row, column=i_col+1, value=self.file_number).style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col+1, value=self.file_number).style = style_regular
                 i_row +=1
-                ws.cell(row=i_row, column=i_col, value='Date Submitted:').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col, value='Date Submitted:').style = style_regular
 
-                ws.cell(row=i_row, column=i_col+1, value='').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col+1, value='').style = style_regular
                 i_row +=1
-                ws.cell(row=i_row, column=i_col, value='Submitter Name:').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col, value='Submitter Name:').style = style_regular
 
-                ws.cell(row=i_row, column=i_col+1, value='').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col+1, value='').style = style_regular
                 i_row +=1
-                ws.cell(row=i_row, column=i_col, value='Email:').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col, value='Email:').style = style_regular
 
-                ws.cell(row=i_row, column=i_col+1, value='').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col+1, value='').style = style_regular
                 i_row +=1
-                ws.cell(row=i_row, column=i_col, value='Ministry/Organization:').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col, value='Ministry/Organization:').style = style_regular
 
-                ws.cell(row=i_row, column=i_col+1, value='').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col+1, value='').style = style_regular
                 i_row +=1
-                ws.cell(row=i_row, column=i_col, value='Net AOI Area (ha)*:').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col, value='Net AOI Area (ha)*:').style = style_regular
 
-                ws.cell(row=i_row, column=i_col+1, value='').style = self.xl_style.regular
+                ws.cell(row=i_row, column=i_col+1, value='').style = style_regular
 
                 # Use the overall area if the sheet is overall, otherwise use the area value for the specific aoi part
                 aoi_value = self.dict_aoi_area[sheet]
                 ws.cell(row=i_row, column=i_col+1, value=aoi_value).style = self.xl_style.number
-                aoi_row = i_row
                 ws.cell(row=i_row, column=i_col+2, 
                         value='*If spatially explicit leave areas are provided they are netted out of the AOI total area (removed). Otherwise, net area = gross area').style = self.xl_style.italics
                 ws.merge_cells(start_row=i_row, start_column=i_col+2, end_row=i_row, end_column=i_col + 6)
 
                 i_row +=2
 
-                # Loop through the lup values in the dictionary
-                for lup in self.dict_lup_values:
+                # If none of the datasets overlap this aoi, then indicate it once rather than writing an empty block for every dataset
+                if not any(lup_ds.get_aoi(aoi=sheet).assessment_units 
+                           for lup in self.dict_lup_values for lup_ds in self.dict_lup_values[lup].values()):
+                    ws.cell(row=i_row, column=i_col, value='No overlap with any of the datasets').style = self.xl_style.regular_na
+                    ws.merge_cells(start_row=i_row, start_column=i_col, end_row=i_row, 
+                                   end_column=i_col + len(self.standard_poly_headers) + 1)
+                    ws.flush()
+                    continue
+
+                # Loop through the lup values in the sheet plan
+                for lup, end_col, lst_ds_plan in lst_sheet_plan:
                     i_col = 2
                     start_col = i_col
                     start_row = i_row
                     self.logger.info(f'Writing {lup} results')
                     # Write the header text
                     header_text = lup
-                    num_fields = 0
-                    ws.cell(row=i_row, column=i_col, value=header_text).style = self.xl_style.value_header
-
-                    for ds in self.dict_lup_values[lup]:
-                        num_fields = len(self.dict_lup_values[lup][ds].other_fields_schema) if len(self.dict_lup_values[lup][ds].other_fields_schema) > num_fields else num_fields
-                    ws.merge_cells(start_row=i_row, start_column=i_col, end_row=i_row, 
-                                       end_column=i_col + len(self.standard_poly_headers) + num_fields + 1)
-                    end_col = i_col + len(self.standard_poly_headers) + num_fields + 1
+                    ws.cell(row=i_row, column=i_col, value=header_text).style = style_value_header
+                    ws.merge_cells(start_row=i_row, start_column=i_col, end_row=i_row, end_column=end_col)
                     i_row += 1
                     
                     # Loop through the datasets for the specified lup value
-                    for ds in self.dict_lup_values[lup]:
+                    for ds, lup_ds, lup_headers, column_length, add_index, lst_field_plan in lst_ds_plan:
                         i_col = 3
-                        # Gather fields, labels and schema for the specific dataset
-                        lup_ds = self.dict_lup_values[lup][ds]
-                        ds_merge_count = 1 if len(lup_ds.aoi[sheet].assessment_units) == 0 \
-                            else len(lup_ds.aoi[sheet].assessment_units)
+                        # Gather the assessment units of the dataset for the aoi
+                        aoi_units = lup_ds.get_aoi(aoi=sheet)
+                        ds_merge_count = 1 if len(aoi_units.assessment_units) == 0 \
+                            else len(aoi_units.assessment_units)
                         # Add in a dataset sub header
-                        ws.cell(row=i_row, column=i_col, value=ds).style = self.xl_style.value_subheader
+                        ws_cell(row=i_row, column=i_col, value=ds).style = style_value_subheader
                         ws.merge_cells(start_row=i_row, start_column=i_col, 
                                        end_row=i_row + ds_merge_count, end_column=i_col)
                         i_col += 1
-                        
-                        lup_fields = list(lup_ds.other_fields_schema.keys())
-                        other_headers = [lup_ds.other_fields_schema[fld].label for fld in lup_ds.other_fields_schema]
-
-                        standard_headers = self.standard_point_headers if lup_ds.data_type == 'Point' else \
-                            self.standard_line_headers if lup_ds.data_type == 'Polyline' else self.standard_poly_headers
-                        lup_headers = [standard_headers[0]] + other_headers + standard_headers[1:]
-                        add_index = i_col + len(lup_fields)
-
-                        column_length = len(lup_headers)
 
                         # Write the standardized column headers and any additional ones specified in the schema
-                        for header in lup_headers:
-                            ws.cell(row=i_row, column=i_col + lup_headers.index(header), 
-                                    value=header).style = self.xl_style.column_header
+                        for header_index, header in enumerate(lup_headers):
+                            ws_cell(row=i_row, column=i_col + header_index, value=header).style = style_column_header
                         i_row += 1
 
                         
-                        au_count = 0
+                        # If there was no overlap with the aoi, then indicate as such in the sheet and move on to the next dataset 
+                        # without setting up the assessment unit values
+                        au_count = len(aoi_units.au_keys)
+                        if au_count == 0:
+                            ws_cell(row=i_row, column=i_col, value=f'No overlap with {ds}').style = style_regular_na
+                            ws.merge_cells(start_row=i_row, start_column=i_col, end_row=i_row, 
+                                           end_column=i_col + column_length-1)
+                            end_row = i_row
+                            i_row += 2
+                            continue
+
+                        # Pull the assessment unit columns of the aoi rather than the attributes of each unit
+                        au_names = aoi_units.au_names
+                        total_areas = aoi_units.total_areas.tolist()
+                        aoi_areas = aoi_units.aoi_areas.tolist()
+
+                        # Calculate the percentages of the dataset as values rather than writing a formula for each row, 
+                        # a zero area has no percentage and is marked as not applicable
+                        au_percents = [aoi_area / total_area if total_area else None 
+                                       for aoi_area, total_area in zip(aoi_areas, total_areas)]
+                        if lup_ds.data_type not in ['Point', 'Polyline']:
+                            aoi_percents = [aoi_area / aoi_value if aoi_value else None for aoi_area in aoi_areas]
+                        else:
+                            aoi_percents = [None] * au_count
                         # Loop through the assessment units for the dataset
-                        for au in lup_ds.aoi[sheet].assessment_units:
-                            au_count += 1
-                            assess_unit = lup_ds.aoi[sheet].assessment_units[au]
+                        for au_index, au in enumerate(aoi_units.au_keys):
+                            assess_unit = aoi_units.assessment_units[au]
                             i = 1
                             # Write the standardized values in the first 5 columns
-                            ws.cell(row=i_row, column=i_col, value=assess_unit.au_name).style=self.xl_style.regular
-                            ws.cell(row=i_row, column=add_index+i, 
-                                    value=lup_ds.aoi[self.str_overall].assessment_units[au].total_area).style=self.xl_style.number
-                            i += 1
-
-                            ws.cell(row=i_row, column=add_index+i, 
-                                    value=assess_unit.aoi_area).style=self.xl_style.number
+                            ws_cell(row=i_row, column=i_col, value=au_names[au_index]).style=style_regular
+                            ws_cell(row=i_row, column=add_index+i, 
+                                    value=total_areas[au_index]).style=style_number
                             i += 1
 
-                            ws.cell(row=i_row, column=add_index+i, 
-                                    value=f'=${get_column_letter(add_index+2)}${i_row}/${get_column_letter(add_index+1)}${i_row}').style=self.xl_style.percent
+                            ws_cell(row=i_row, column=add_index+i, 
+                                    value=aoi_areas[au_index]).style=style_number
                             i += 1
 
-                            if lup_ds.data_type not in ['Point', 'Polyline']:
-                                value = f'=${get_column_letter(add_index+2)}${i_row}/${get_column_letter(3)}${aoi_row}'
-                                style = self.xl_style.percent
-                            else:
-                                value = 'N/A'
-                                style = self.xl_style.regular_na
-                            
-                            ws.cell(row=i_row, column=add_index+i, value=value).style=style
+                            for value in (au_percents[au_index], aoi_percents[au_index]):
+                                if value is None:
+                                    ws_cell(row=i_row, column=add_index+i, value='N/A').style=style_regular_na
+                                else:
+                                    ws_cell(row=i_row, column=add_index+i, value=value).style=style_percent
+                                i += 1
 
                             # Loop through the additional fields for the dataset
-                            for ce_fld in lup_fields:
-                                # Pull the values from the schema object
-                                ce_schema = lup_ds.other_fields_schema[ce_fld]
-                                col_index = i_col + lup_headers.index(ce_schema.label)
+                            for ce_fld, ce_schema, col_index, other_flds in lst_field_plan:
                                 try:
-                                    ce_value = lup_ds.aoi[sheet].assessment_units[au].other_fields[ce_fld]
+                                    ce_value = assess_unit.other_fields[ce_fld]
                                 except:
                                     continue
 
-                                # Convert to a float rounded to two decimal places if the value is a decimal
-                                try:
-                                    flt_value = float(ce_value)
-                                    ce_value = round(ce_value, 3) if '.' in str(ce_value) else ce_value
-                                except:
-                                    pass
-                                ws.cell(row=i_row, column=col_index, value=ce_value)
+                                # Round the value to three decimal places if the value is a decimal
+                                if isinstance(ce_value, float):
+                                    ce_value = round(ce_value, 3)
 
                                 # If there isn't a value, then keep the cell style as regular
                                 if not ce_value:
-                                    ws.cell(row=i_row, column=col_index).style = self.xl_style.regular
+                                    ws_cell(row=i_row, column=col_index, value=ce_value).style = style_regular
                                     continue
 
                                 # Gather the other field information and add it within brackets after the main value
-                                if ce_schema.other_fields:
-                                    lst_other_values = [lup_ds.aoi[sheet].assessment_units[au].other_fields[o_fld] for o_fld in ce_schema.other_fields]
-                                    join_val = f'{ws.cell(row=i_row, column=col_index).value} ({",".join(lst_other_values)})'
-                                    ws.cell(row=i_row, column=col_index, value=join_val)
+                                cell_value = ce_value
+                                if other_flds:
+                                    other_values = ",".join(map(str, (assess_unit.other_fields[o_fld] for o_fld in other_flds)))
+                                    cell_value = f'{ce_value} ({other_values})'
 
                                 # Pull the formatting values from the schema object and create the cell style
-                                cell_style = self.xl_style.regular
-                                if ce_schema.value_type:
-                                    # If the value type is discrete, pull the values as is based on the data
-                                    if ce_schema.value_type == 'Discrete':
-                                        val_style = ce_schema.dict_values[ce_value]
-
-                                    # If the value type is a range, then cycle through the different range types and assign     the format if it meets the requirements
-                                    elif ce_schema.value_type == 'Range':
-                                        for val_key in ce_schema.dict_values:
-                                            val_schema = ce_schema.dict_values[val_key]
-                                            if val_schema.range_low and val_schema.range_high:
-                                                if val_schema.range_low <= ce_value <= val_schema.range_high:
-                                                    break
-                                            elif not val_schema.range_low and val_schema.range_high:
-                                                if val_schema.range_operator == '<=' and ce_value <= val_schema.range_high:
-                                                    break
-                                                elif val_schema.range_operator == '<' and ce_value < val_schema.range_high:
-                                                    break
-                                            elif val_schema.range_low and not val_schema.range_high:
-                                                if val_schema.range_operator == '>=' and ce_value >= val_schema.range_low:
-                                                    break
-                                                elif val_schema.range_operator == '>' and ce_value > val_schema.range_low:
-                                                    break
-                                        val_style = val_schema
-
-
-                                    # Create a new style object based on the extracted formats, then assign it to the cell
-                                    cell_style = self.xl_style.create_style_copy(wb=wb, 
-                                                                                 name=f'{lup}-{ds}-{sheet}-{ce_fld}-    {ce_value}', font=val_style.style_font, 
-                                                                                 align=val_style.style_align,   border=val_style.style_border,    fill=val_style.style_fill,     num_format=val_style.style_format)
-
-                                ws.cell(row=i_row, column=col_index).style = cell_style
-                            end_row = i_row
-                            i_row += 1
+                                cell_style = style_regular
+                                val_style = ce_schema.get_value_schema(value=ce_value)
+                                if val_style:
+                                    # Use the named style of the extracted formats, it is only created the first time it is used
+                                    cell_style = get_value_style(value_schema=val_style)
 
-                        # If there was no overlap with the aoi, then indicate as such in the sheet and mvoe on to the next  dataset
-                        if au_count == 0:
-                            ws.cell(row=i_row, column=i_col, value=f'No overlap with {ds}').style = self.xl_style.regular_na
-                            ws.merge_cells(start_row=i_row, start_column=i_col, end_row=i_row, 
-                                       end_column=i_col + column_length-1)
+                                ws_cell(row=i_row, column=col_index, value=cell_value).style = cell_style
                             end_row = i_row
                             i_row += 1
                         
@@ -1178,33 +1110,39 @@ class LUP_Overlaps:
                     #     i_row += 3
                         
 
-                    for row_idx in range(start_row, end_row + 1):
-                        for col_idx in range(start_col, end_col + 1):
-                            cell = ws.cell(row=row_idx, column=col_idx)
-                            cur_border = copy(cell.border) if cell.border else Border()
-
-                            if row_idx == start_row:
-                                cur_border.top = Side(style='thick')
-                            if row_idx == end_row:
-                                cur_border.bottom = Side(style='thick')
-                            if col_idx == start_col:
-                                cell.style = self.xl_style.value_header
-                                cur_border.left = Side(style='thick')
-                            if col_idx == end_col:
-                                cur_border.right = Side(style='thick')
-                            if col_idx == start_col and row_idx == start_row:
-                                cur_border.bottom = None
-                            cell.border = cur_border
-
-
-                i_col = 1
-                # Set the column widths
-                ws.column_dimensions[get_column_letter(i_col)].width = 1
-                ws.column_dimensions[get_column_letter(i_col+1)].width = 20
-                ws.column_dimensions[get_column_letter(i_col+2)].width = 60
-                ws.column_dimensions[get_column_letter(i_col+3)].width = 45
-                for i in range(i_col+4, i_col+12):
-                    ws.column_dimensions[get_column_letter(i)].width = 25
+                    # Only the cells on the edges of the block get the thick border, so the interior cells are not visited
+                    lst_edge_cells = [(start_row, col_idx) for col_idx in range(start_col, end_col + 1)]
+                    if end_row != start_row:
+                        lst_edge_cells.extend((end_row, col_idx) for col_idx in range(start_col, end_col + 1))
+                    lst_edge_cells.extend((row_idx, start_col) for row_idx in range(start_row + 1, end_row))
+                    if end_col != start_col:
+                        lst_edge_cells.extend((row_idx, end_col) for row_idx in range(start_row + 1, end_row))
+
+                    for row_idx, col_idx in lst_edge_cells:
+                        cell = ws_cell(row=row_idx, column=col_idx)
+                        # Build the new border from the sides of the current one rather than copying it, the sides are not changed
+                        cur_border = cell.border
+                        if col_idx == start_col:
+                            cell.style = style_value_header
+
+                        if col_idx == start_col and row_idx == start_row:
+                            bottom_side = None
+                        elif row_idx == end_row:
+                            bottom_side = thick_side
+                        else:
+                            bottom_side = cur_border.bottom
+                        cell.border = Border(left=thick_side if col_idx == start_col else cur_border.left, 
+                                             right=thick_side if col_idx == end_col else cur_border.right, 
+                                             top=thick_side if row_idx == start_row else cur_border.top, 
+                                             bottom=bottom_side, diagonal=cur_border.diagonal, 
+                                             diagonalUp=cur_border.diagonalUp, diagonalDown=cur_border.diagonalDown, 
+                                             outline=cur_border.outline)
+
+                    # The rows of this lup value are complete, stream them out to the workbook
+                    ws.flush(end_row=i_row - 1)
+
+                # Stream the remaining staged cells out to the workbook
+                ws.flush()
 
         except Exception as e:
             self.logger.error(f'Error creating the excel: {e}')
@@ -1215,6 +1153,11 @@ class LUP_Overlaps:
         wb.active = wb.worksheets[0]
         wb.save(self.xls_output)
 
+        # Release the workbook and the styles that reference it now the output has been saved
+        self.xl_style = None
+        del wb
+        gc.collect()
+
 
 class LU_Value:
     """
@@ -1222,6 +1165,10 @@ class LU_Value:
 
     Support class object that contains all information about LU Values as pulled from the schema
     """
+    __slots__ = ('name', 'category', 'id_fields', 'assessment_fields', 'no_id', 'path', 'data_type', 'sql',
+                 'source_field', 'join_path', 'join_field', 'join_table_type', 'buffer', 'fc_union', 'aoi',
+                 'other_fields_schema')
+
     def __init__(self, name:str, category:str, id_fields: list=[], assess_fields:list=[], 
                  path:str='', sql:str=None, source_field:str=None, join_table_path:str=None, 
                  join_table_type:str=None, join_table_field:str=None, buffer: float=None) -> None:
@@ -1266,12 +1213,28 @@ class LU_Value:
         self.aoi = defaultdict(AOI) # Dictionary of AOI objects
         self.other_fields_schema = defaultdict(FieldSchema) # Dictionary of FieldSchema objects
 
+    def get_aoi(self, aoi: str) -> 'AOI':
+        """
+        CLASS METHOD
+
+        get_aoi: Returns the AOI object of an aoi without adding it to the dictionary.  Reading the dictionary directly creates an empty AOI object for every aoi the dataset does not overlap
+
+        Args:
+            aoi (str): name of the aoi
+
+        Returns:
+            AOI: AOI object of the aoi, an empty AOI object if the dataset has no results for the aoi
+        """
+        return self.aoi[aoi] if aoi in self.aoi else AOI()
+
 class AOI:
     """ 
     CLASS
     
     Support class to contain information applicable to area of interests
     """
+    __slots__ = ('total_area', 'total_count', 'assessment_units', 'au_keys', 'au_names', 'total_areas', 'aoi_areas')
+
     def __init__(self) -> None:
         """
         CLASS METHOD
@@ -1281,7 +1244,28 @@ class AOI:
         self.total_area = 0
         self.total_count = 0
         self.assessment_units = defaultdict(Assessment_Unit) # Dictionary of Assessment_Unit objects
-    
+        self.au_keys = [] # Assessment unit keys in the order of the columns below
+        self.au_names = []
+        self.total_areas = np.zeros(0)
+        self.aoi_areas = np.zeros(0)
+
+    def build_columns(self, overall: 'AOI') -> None:
+        """
+        CLASS METHOD
+
+        build_columns: Gathers the names and areas of the assessment units into parallel columns so they can be totalled and written without visiting each object
+
+        Args:
+            overall (AOI): overall aoi object, the total area of an assessment unit is always taken from the overall aoi
+        """
+        self.au_keys = list(self.assessment_units)
+        au_count = len(self.au_keys)
+        self.au_names = [self.assessment_units[au].au_name for au in self.au_keys]
+        overall_units = overall.assessment_units
+        self.total_areas = np.fromiter((overall_units[au].total_area if au in overall_units else 0 for au in self.au_keys), 
+                                       dtype=np.float64, count=au_count)
+        self.aoi_areas = np.fromiter((self.assessment_units[au].aoi_area for au in self.au_keys), 
+                                     dtype=np.float64, count=au_count)
 
 
 class Assessment_Unit:
@@ -1290,6 +1274,9 @@ class Assessment_Unit:
 
     Support class to contain information applicable to assessment units
     """
+    # There is an object for every assessment unit of every aoi and dataset, so the attributes are held in slots rather than a dictionary per object
+    __slots__ = ('total_area', 'total_count', 'aoi_area', 'au_name', 'other_fields')
+
     def __init__(self) -> None:
         """
         CLASS METHOD
@@ -1300,7 +1287,7 @@ class Assessment_Unit:
         self.total_count = 0
         self.aoi_area = 0
         self.au_name = ''
-        self.other_fields = defaultdict()
+        self.other_fields = {} # Dictionary of the additional field values of the last record within the lup value
 
 class FieldSchema:
     """
@@ -1308,6 +1295,8 @@ class FieldSchema:
 
     Support class to contain information applicable to field schemas
     """
+    __slots__ = ('name', 'label', 'dict_values', 'value_type', 'other_fields', 'dict_resolved')
+
     def __init__(self) -> None:
         """
         CLASS METHOD
@@ -1319,6 +1308,47 @@ class FieldSchema:
         self.dict_values = defaultdict(ValueSchema) # Dictionary of ValueSchema objects
         self.value_type = ''
         self.other_fields = []
+        self.dict_resolved = {} # Dictionary of the ValueSchema objects already matched to each value
+
+    def get_value_schema(self, value) -> 'ValueSchema':
+        """
+        CLASS METHOD
+
+        get_value_schema: Finds the value schema used to format a value.  The match only depends on the schema so each value is resolved once and then reused
+
+        Args:
+            value: value to find the formatting for
+
+        Returns:
+            ValueSchema: value schema object matching the value, None if the field does not have a discrete or range value type
+        """
+        if value in self.dict_resolved:
+            return self.dict_resolved[value]
+
+        val_schema = None
+        # If the value type is discrete, pull the values as is based on the data
+        if self.value_type == 'Discrete':
+            val_schema = self.dict_values[value]
+
+        # If the value type is a range, then cycle through the different range types and assign the format if it meets the requirements
+        elif self.value_type == 'Range':
+            for val_schema in self.dict_values.values():
+                if val_schema.range_low and val_schema.range_high:
+                    if val_schema.range_low <= value <= val_schema.range_high:
+                        break
+                elif not val_schema.range_low and val_schema.range_high:
+                    if val_schema.range_operator == '<=' and value <= val_schema.range_high:
+                        break
+                    elif val_schema.range_operator == '<' and value < val_schema.range_high:
+                        break
+                elif val_schema.range_low and not val_schema.range_high:
+                    if val_schema.range_operator == '>=' and value >= val_schema.range_low:
+                        break
+                    elif val_schema.range_operator == '>' and value > val_schema.range_low:
+                        break
+
+        self.dict_resolved[value] = val_schema
+        return val_schema
 
 class ValueSchema:
     """
@@ -1326,6 +1356,9 @@ class ValueSchema:
 
     Support class to contain information applicable to value schemas
     """
+    __slots__ = ('discrete_value', 'range_high', 'range_low', 'range_operator', 'label', 'style_font', 'style_align',
+                 'style_border', 'style_fill', 'style_format', 'style_name')
+
     def __init__(self) -> None:
         """
         CLASS METHOD
@@ -1342,6 +1375,114 @@ class ValueSchema:
         self.style_border = Border # OpenPyXl border object
         self.style_fill = PatternFill # OpenPyXl patternfill object
         self.style_format = ''
+        self.style_name = '' # Name of the workbook style shared by values with the same formatting
+
+class WorksheetBuffer:
+    """
+    CLASS
+
+    Support class that stages the cells of a sheet so they can be streamed row by row into a write only OpenPyXl workbook
+    """
+    def __init__(self, wb: openpyxl.Workbook, title: str) -> None:
+        """
+        CLASS METHOD
+
+        __init__: Initializes the properties associated with the class object and creates the sheet in the workbook
+
+        Args:
+            wb (openpyxl.Workbook): OpenPyXl workbook object
+            title (str): title of the sheet
+        """
+        self.ws = wb.create_sheet(title=title)
+        self.cells = defaultdict(dict) # Dictionary of staged cells keyed by row, then column
+        self.max_row = 0
+        self.max_column = 0
+        self.flushed_row = 0 # Last row that has been streamed to the sheet
+
+    def set_column_widths(self, lst_widths: list) -> None:
+        """
+        CLASS METHOD
+
+        set_column_widths: Sets the widths of the sheet columns with one dimension object per column, rather than creating a default dimension and then changing its width.  These need to be set before any rows are streamed
+
+        Args:
+            lst_widths (list): list of column letter and width pairs
+        """
+        column_dimensions = self.ws.column_dimensions
+        for col_letter, col_width in lst_widths:
+            column_dimensions[col_letter] = ColumnDimension(worksheet=self.ws, index=col_letter, width=col_width)
+
+    def cell(self, row: int, column: int, value=None) -> Cell:
+        """
+        CLASS METHOD
+
+        cell: Returns the staged cell at the given position, creating it if it does not exist yet
+
+        Args:
+            row (int): row index of the cell
+            column (int): column index of the cell
+            value (optional): value to write into the cell. Defaults to None.
+
+        Returns:
+            Cell: OpenPyXl cell object
+        """
+        cell = self.cells[row].get(column)
+        if cell is None:
+            if row <= self.flushed_row:
+                raise ValueError(f'Row {row} has already been written to the sheet')
+            cell = WriteOnlyCell(ws=self.ws)
+            self.cells[row][column] = cell
+            if row > self.max_row:
+                self.max_row = row
+            if column > self.max_column:
+                self.max_column = column
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def merge_cells(self, start_row: int, start_column: int, end_row: int, end_column: int) -> None:
+        """
+        CLASS METHOD
+
+        merge_cells: Registers a merged cell range on the sheet and carries the borders of the first cell out to the edges of the range, matching what OpenPyXl does for a standard worksheet
+
+        Args:
+            start_row (int): first row of the range
+            start_column (int): first column of the range
+            end_row (int): last row of the range
+            end_column (int): last column of the range
+        """
+        self.ws.merged_cells.add(CellRange(min_row=start_row, min_col=start_column, max_row=end_row, 
+                                           max_col=end_column))
+
+        start_border = self.cell(row=start_row, column=start_column).border
+        dict_edges = {'top': [(start_row, col) for col in range(start_column, end_column + 1)],
+                      'bottom': [(end_row, col) for col in range(start_column, end_column + 1)],
+                      'left': [(row, start_column) for row in range(start_row, end_row + 1)],
+                      'right': [(row, end_column) for row in range(start_row, end_row + 1)]}
+        for side_name in dict_edges:
+            side = getattr(start_border, side_name)
+            if not side or side.style is None:
+                continue
+            for row, col in dict_edges[side_name]:
+                cell = self.cell(row=row, column=col)
+                cell.border += Border(**{side_name: side})
+
+    def flush(self, end_row: int=None) -> None:
+        """
+        CLASS METHOD
+
+        flush: Appends the staged cells to the sheet in row order and releases them.  Rows that have been flushed can no longer be changed
+
+        Args:
+            end_row (int, optional): last row to write to the sheet. Defaults to None, which writes all the staged rows.
+        """
+        end_row = self.max_row if end_row is None else min(end_row, self.max_row)
+        for i_row in range(self.flushed_row + 1, end_row + 1):
+            dict_row = self.cells.pop(i_row, {})
+            self.ws.append([dict_row.get(i_col) for i_col in range(1, max(dict_row, default=0) + 1)])
+        self.flushed_row = max(self.flushed_row, end_row)
+
 
 class ExcelStyles:
     """
@@ -1359,7 +1500,10 @@ class ExcelStyles:
             wb (openpyxl.Workbook): OpenPyXl workbook object
         """
         self.thin_border = Side(style='thin', color='000000')
+        self.thick_border = Side(style='thick') # Shared by the borders drawn around each dataset block
         self.wb = wb
+        self.dict_wrap_aligns = {} # Dictionary of wrapped text copies of the alignments used by the copied named styles
+        self.set_value_styles = set() # Names of the schema value styles already created in the workbook
 
         # Create the standard styles in the workbook upon creation of the class object
         self.title = self.create_style(wb=self.wb, name='title', bold=True, font_size=12, horiz_align='left')
@@ -1451,16 +1595,18 @@ class ExcelStyles:
             NamedStyle: OpenPyXl Named style object created from the input parameters
         """
 
-        # Delete the named style if it already exists in the workbook
-        if name in wb.named_styles:
-            del wb._named_styles[wb.style_names.index(name)]
-
         # Create new style object and assign properties
 
+        # Wrap the text on a copy of the alignment, the alignment passed in is shared with the schema and other styles
+        wrap_align = self.dict_wrap_aligns.get(align)
+        if wrap_align is None:
+            wrap_align = copy(align)
+            wrap_align.wrap_text = True
+            self.dict_wrap_aligns[align] = wrap_align
+
         new_style = NamedStyle(name=name)
         new_style.font = font
-        new_style.alignment = align
-        new_style.alignment.wrap_text = True
+        new_style.alignment = wrap_align
         new_style.border = border
         new_style.fill = fill
         new_style.number_format = num_format
@@ -1470,6 +1616,374 @@ class ExcelStyles:
 
         return new_style
 
+    def get_value_style(self, value_schema: 'ValueSchema') -> str:
+        """
+        CLASS METHOD
+
+        get_value_style: Returns the name of the named style for the formatting of a schema value, it is only created in the workbook the first time it is requested
+
+        Args:
+            value_schema (ValueSchema): value schema object containing the formatting
+
+        Returns:
+            str: name of the OpenPyXl Named style created from the value schema formatting
+        """
+        # The style name is set once per unique formatting when the schema is read, so the name is all that is needed to tell if 
+        # the style has already been created
+        style_name = value_schema.style_name
+        if style_name not in self.set_value_styles:
+            self.create_style_copy(wb=self.wb, name=style_name, font=value_schema.style_font, 
+                                   align=value_schema.style_align, border=value_schema.style_border, 
+                                   fill=value_schema.style_fill, num_format=value_schema.style_format)
+            self.set_value_styles.add(style_name)
+        return style_name
+
+
+def parse_range_value(value: str) -> float:
+    """
+    FUNCTION
+
+    parse_range_value: Converts a bound of a schema range to a number, percent values are converted to a fraction
+
+    Args:
+        value (str): range bound as written in the schema
+
+    Returns:
+        float: numeric value of the bound
+    """
+    if value.endswith('%'):
+        return float(value[:-1]) / 100
+    return float(value)
+
+
+def check_overlaps(fc_one: str, ext_two) -> bool:
+    """
+    FUNCTION
+
+    check_overlaps: Compares the extent of a dataset with another extent to quickly rule out datasets that cannot overlap.  Datasets whose extents intersect may still not overlap
+
+    Args:
+        fc_one (str): dataset to check
+        ext_two (arcpy.Extent): extent to compare against, described once by the caller so it is not described again for every dataset
+
+    Returns:
+        bool: False if the extents do not intersect, otherwise True.  True if the extent could not be described or projected, so the selection decides
+    """
+    try:
+        ext_one = arcpy.Describe(fc_one).extent.projectAs(ext_two.spatialReference)
+    except Exception:
+        return True
+    return not (ext_one.XMax < ext_two.XMin or ext_one.XMin > ext_two.XMax or 
+                ext_one.YMax < ext_two.YMin or ext_one.YMin > ext_two.YMax)
+
+
+def process_lup_ds(lup_ds: LU_Value, aoi_fc: str, work_path: str, out_gdb: str, temp_gdb: str, aoi_field: str, 
+                   str_overall: str, logger: logging.Logger, aoi_extent=None, select_fc: str=None) -> LU_Value:
+    """
+    FUNCTION
+
+    process_lup_ds: Performs the overlay between the aoi and a single lup value dataset, then stores the results in the lup value object. Kept at the module level so it can be run within a worker process
+
+    Args:
+        lup_ds (LU_Value): lup value object to run the overlay on
+        aoi_fc (str): net area of interest feature class
+        work_path (str): workspace the unioned dataset is written to
+        out_gdb (str): geodatabase any join tables are copied to
+        temp_gdb (str): workspace for the intermediate datasets
+        aoi_field (str): area of interest field
+        str_overall (str): name used for the overall area of interest
+        logger (logging.Logger): logger object for messaging
+        aoi_extent (arcpy.Extent, optional): extent of the aoi. Defaults to None, in which case it is described from the aoi feature class.
+        select_fc (str, optional): dissolved aoi feature class used to select the dataset features. Defaults to None, in which case the aoi feature class is used.
+
+    Returns:
+        LU_Value: lup value object with the overlay results
+    """
+    fld_id_aoi = f'FID_net_aoi'
+    if not aoi_extent:
+        aoi_extent = arcpy.Describe(aoi_fc).extent
+    if not select_fc:
+        select_fc = aoi_fc
+
+    logger.info(f'Running overlay on {lup_ds.name}')
+    in_fc = lup_ds.path
+    join_fc = lup_ds.join_path
+    buffer = lup_ds.buffer
+    sql = lup_ds.sql
+    id_flds = ','.join(lup_ds.id_fields)
+    if not lup_ds.id_fields:
+        id_flds = 'OBJECTID'
+    lst_additional = []
+    for fld in lup_ds.other_fields_schema:
+        lst_additional.extend([fld] + lup_ds.other_fields_schema[fld].other_fields)
+
+    temp_fc = os.path.join(temp_gdb, 'temp_fc')
+    intersect_fc = os.path.join(temp_gdb, 'intersect_fc')
+    buffer_fc = os.path.join(temp_gdb, 'buffer_fc')
+    erase_fc = os.path.join(temp_gdb, 'erase_fc')
+    ds_name = str(lup_ds.name).lower().translate(name_table)
+    union_name = f'union_{ds_name}'
+    union_fc = os.path.join(work_path, union_name)
+
+
+    # Skip the selection entirely if the dataset lies outside the extent of the aoi
+    if not check_overlaps(fc_one=in_fc, ext_two=aoi_extent):
+        logger.warning('***Dataset does not overlap AOI***')
+        return lup_ds
+
+    # Remove the intermediate datasets from the memory workspace once the union is built, including when the dataset is skipped or a tool fails part way through
+    try:
+        # Select the features intersecting the dissolved aoi.  The features are not clipped as the full features are needed for the assessment unit totals
+        fc_lyr = arcpy.management.MakeFeatureLayer(in_features=in_fc, out_layer='fc_lyr', where_clause=sql)
+        arcpy.management.SelectLayerByLocation(in_layer=fc_lyr, overlap_type='INTERSECT',select_features=select_fc)
+
+        # Count the selection once, only copying the features out if any intersect the aoi
+        result = int(arcpy.management.GetCount(fc_lyr)[0])
+        if result > 0:
+            # Only export the fields used for the assessment units, additional fields and join rather than every field of the dataset
+            set_keep = {fld.upper() for fld in lup_ds.id_fields + lup_ds.assessment_fields + lst_additional + 
+                        [lup_ds.source_field] if fld}
+            field_mappings = arcpy.FieldMappings()
+            field_mappings.addTable(fc_lyr)
+            for i in reversed(range(field_mappings.fieldCount)):
+                if field_mappings.getFieldMap(i).getInputFieldName(0).upper() not in set_keep:
+                    field_mappings.removeFieldMap(i)
+            arcpy.conversion.ExportFeatures(in_features=fc_lyr, out_features=temp_fc, field_mapping=field_mappings)
+        arcpy.management.Delete(in_data=fc_lyr)
+        # arcpy.analysis.Select(in_features=in_fc, out_feature_class=temp_fc, where_clause=sql)
+
+        if result == 0:
+            # arcpy.analysis.Select(in_features=in_fc, out_feature_class=os.path.join(work_path, 'temp_fc'), where_clause=sql)
+            logger.warning('***Dataset does not overlap AOI***')
+            return lup_ds
+
+        fld_id_lu = f'FID_{ds_name}'
+        fld_id_lu = fld_id_lu[:60] if len(fld_id_lu) > 60 else fld_id_lu
+        arcpy.management.AddField(in_table=temp_fc, field_name=fld_id_lu, field_type='LONG')
+
+        lup_id = 1
+        # Number the features; only features intersecting the aoi were copied so the geometries do not need to be checked again here
+        with arcpy.da.UpdateCursor(temp_fc, [fld_id_lu]) as cursor:
+            for row in cursor:
+                row[0] = lup_id
+                lup_id += 1
+                cursor.updateRow(row)
+
+        if buffer:
+            logger.info(f'    - buffering by {buffer} metres')
+            arcpy.analysis.PairwiseBuffer(in_features=temp_fc, out_feature_class=buffer_fc,
+                                           buffer_distance_or_field=buffer)
+            arcpy.management.Delete(temp_fc)
+            temp_fc = buffer_fc
+
+        logger.info('    - intersecting with aoi')
+        arcpy.analysis.PairwiseIntersect(in_features=[aoi_fc, temp_fc], out_feature_class=intersect_fc)
+        logger.info('    - erasing aoi')
+        arcpy.analysis.PairwiseErase(in_features=temp_fc, erase_features=aoi_fc,
+                                      out_feature_class=erase_fc)
+        logger.info('    - combining datasets')
+        arcpy.management.Merge(inputs=[intersect_fc, erase_fc], output=union_fc, 
+                               field_match_mode='USE_FIRST_SCHEMA')
+    finally:
+        # Delete takes a list of datasets, so remove them in a single tool call
+        lst_delete = [fc for fc in [temp_fc, buffer_fc, intersect_fc, erase_fc] if arcpy.Exists(fc)]
+        if lst_delete:
+            arcpy.management.Delete(in_data=lst_delete)
+
+    ds_type = arcpy.Describe(union_fc).shapeType
+    lup_ds.data_type = ds_type
+
+
+    # Compile the list of fields to search the unioned dataset based on the input schema.  Points are counted so their geometries 
+    # are not read at all; lines and polygons read the length as well so a record without an area falls back to it
+    lst_shape_fields = [] if ds_type == 'Point' else ['SHAPE@AREA', 'SHAPE@LENGTH']
+    lst_fields = lst_shape_fields + [fld_id_aoi, fld_id_lu] + \
+                    (list(set(lup_ds.assessment_fields) - set(lup_ds.id_fields))) + lup_ds.id_fields
+    lst_fields = [fld for fld in lst_fields if fld != 'OBJECTID']
+    lst_fields.extend(lst_additional)
+    if aoi_field:
+        lst_fields.append(aoi_field)
+
+    # If there is a join tables specifed in the schema for this value then, read the join values of each source value so they 
+    # can be added to the rows of the unioned dataset as it is read, rather than writing them into the unioned dataset
+    lst_join_fields = []
+    dict_join = {}
+    if join_fc:
+        # If the join fields were not specified correctly in the excel schema, then don't perform the join
+        if not any([lup_ds.source_field, lup_ds.join_field]):
+            logger.warning('The fields required for the table join were not specified in the schema')
+        else:
+            logger.info(f'Joining {os.path.basename(join_fc)} to dataset')
+            try:
+                # Copy the specified table to the geodatabase then read the fields searched for that are not already in the unioned dataset
+                join_tbl = os.path.join(out_gdb, f'{os.path.basename(union_fc)}_jointable')
+                arcpy.management.CopyRows(in_rows=join_fc, out_table=join_tbl)
+                set_union_fields = {fld.name for fld in arcpy.Describe(union_fc).fields}
+                lst_join_fields = [fld.name for fld in arcpy.Describe(join_tbl).fields if fld.name.upper() not in 
+                                   join_skip_fields and fld.name not in set_union_fields and fld.name in lst_fields]
+
+                # Keep the first join record for each value
+                with arcpy.da.SearchCursor(in_table=join_tbl, field_names=[lup_ds.join_field] + lst_join_fields) as s_cursor:
+                    for row in s_cursor:
+                        dict_join.setdefault(row[0], row[1:])
+            except:
+                lst_join_fields = []
+                dict_join = {}
+                logger.warning('Something went wrong with the join, could not complete the operation')
+
+    # Read the unioned dataset once and pull the attributes out of the rows in memory.  The SQL clause was already applied when selecting the features and the fields it uses may not have been exported
+    if lst_join_fields:
+        # The join fields are appended to each row from the join values of its source field, left empty where there is no match
+        set_join_fields = set(lst_join_fields)
+        lst_fields = [fld for fld in lst_fields if fld not in set_join_fields] + [lup_ds.source_field]
+        i_source = len(lst_fields) - 1
+        no_match = (None,) * len(lst_join_fields)
+        with arcpy.da.SearchCursor(in_table=union_fc, field_names=lst_fields) as s_cursor:
+            lst_rows = [row + dict_join.get(row[i_source], no_match) for row in s_cursor]
+        lst_fields.extend(lst_join_fields)
+    else:
+        with arcpy.da.SearchCursor(in_table=union_fc, field_names=lst_fields) as s_cursor:
+            lst_rows = [row for row in s_cursor]
+
+    # If the SQL clause resulted in no records returned, output warning of no overlap
+    if not lst_rows:
+        logger.warning(f'+++Value does not overlap the area of interest with the SQL clause: {lup_ds.sql}+++')
+        return lup_ds
+
+    # Map each field to its position in the row once rather than searching the field list for every value
+    dict_field_index = {fld: i for i, fld in enumerate(lst_fields)}
+    lst_id_index = [dict_field_index[fld] for fld in lup_ds.id_fields]
+    lst_assess_index = [dict_field_index[fld] for fld in lup_ds.assessment_fields]
+    lst_other_index = [(o_fld, dict_field_index[o_fld]) for o_fld in lst_additional]
+    i_area = dict_field_index.get('SHAPE@AREA')
+    i_length = dict_field_index.get('SHAPE@LENGTH')
+    i_aoi_id = dict_field_index[fld_id_aoi]
+    i_lup_id = dict_field_index[fld_id_lu]
+    i_aoi = dict_field_index[aoi_field] if aoi_field else None
+
+    # Loop through the records in the unioned resultant once, pulling out the required attributes for each assessment unit and 
+    # gathering a set of the assessment units that intersect the area of interest
+    set_intersecting_aus = set()
+    lst_records = []
+    for row in lst_rows:
+        if ds_type == 'Point':
+            shp = 1
+        elif row[i_area]:
+            shp = row[i_area]/10000
+        else:
+            shp = row[i_length]
+        fid_aoi = row[i_aoi_id]
+        fid_lup = row[i_lup_id]
+        aoi = None if i_aoi is None else row[i_aoi]
+
+        # Datasets without id or assessment fields are summarized as a single assessment unit, so there is nothing to build
+        if lup_ds.no_id:
+            au = au_name = 'All Units'
+        else:
+            # Create the assessment unit id; takes into account if more than one field was selected
+            lst_au = [str(row[i]) for i in lst_id_index if str(row[i]) not in ['', 'None']]
+            if not lst_au:
+                continue
+            au = ' '.join(lst_au)
+            if fid_aoi and fid_aoi != -1:
+                set_intersecting_aus.add(au)
+
+            # Create the assessment unit name; takes into account if more than one field was selected
+            au_name = ' '.join(str(row[i]) if str(row[i]) not in ['', 'None'] else 'Unnamed' for i in lst_assess_index)
+
+        # Flag if the feature is within the area of interest and if it is also within the lup value.  A NaN id is the only value not equal to itself
+        in_aoi = bool(fid_aoi and fid_aoi != -1 and fid_aoi == fid_aoi)
+        in_lup = in_aoi and fid_lup != -1 and fid_lup is not None and fid_lup == fid_lup
+        dict_other = {o_fld: row[i] if row[i] else '' for o_fld, i in lst_other_index}
+        lst_records.append([au, au_name, aoi if aoi else None, shp, in_aoi, in_lup, dict_other])
+
+    if not lst_records:
+        return lup_ds
+
+    # Accumulate the areas with pandas group by reductions rather than incrementing the lup value object for every record
+    au_df = pd.DataFrame(lst_records, columns=['AU', 'AU_NAME', 'AOI', 'SHP', 'IN_AOI', 'IN_LUP', 'OTHER'], 
+                         dtype=object)
+    au_df['SHP'] = au_df['SHP'].astype(float)
+    au_df['IN_AOI'] = au_df['IN_AOI'].astype(bool)
+    au_df['IN_LUP'] = au_df['IN_LUP'].astype(bool)
+
+    # Drop the records of assessment units that do not intersect the area of interest
+    au_df = au_df.loc[au_df['AU'].isin(set_intersecting_aus) | (au_df['AU'] == 'All Units')].copy()
+    if au_df.empty:
+        return lup_ds
+    au_df['AOI_SHP'] = au_df['SHP'].where(au_df['IN_AOI'], 0.0)
+    au_df['LUP_SHP'] = au_df['SHP'].where(au_df['IN_LUP'], 0.0)
+    aoi_df = au_df.loc[au_df['AOI'].notna()]
+
+    # Increment total area of the aoi for overall and the aoi if an aoi field was selected
+    lup_ds.aoi[str_overall].total_area += float(au_df['AOI_SHP'].sum())
+    lup_ds.aoi[str_overall].total_count += int(au_df['IN_AOI'].sum())
+    for aoi, aoi_area, aoi_count in aoi_df.groupby('AOI', sort=False)[['AOI_SHP', 'IN_AOI']].sum().itertuples(name=None):
+        lup_ds.aoi[aoi].total_area += float(aoi_area)
+        lup_ds.aoi[aoi].total_count += int(aoi_count)
+
+    # Increment the total area of the assessment unit and the area within the lup value for overall.  The grouped rows are read 
+    # as plain tuples rather than with iterrows, which builds a series for every row
+    overall_df = au_df.groupby('AU', sort=False).agg(AU_NAME=('AU_NAME', 'last'), TOTAL_AREA=('SHP', 'sum'), 
+                                                      LUP_AREA=('LUP_SHP', 'sum'))
+    overall_units = lup_ds.aoi[str_overall].assessment_units
+    for au, au_name, total_area, lup_area in overall_df.itertuples(name=None):
+        assess_unit = overall_units[au]
+        assess_unit.au_name = au_name
+        assess_unit.total_area += float(total_area)
+        assess_unit.aoi_area += float(lup_area)
+
+    # Do the same for each aoi if an aoi field was selected, also counting the records
+    aoi_au_df = aoi_df.groupby(['AOI', 'AU'], sort=False).agg(AU_NAME=('AU_NAME', 'last'), TOTAL_AREA=('SHP', 'sum'), 
+                                                              TOTAL_COUNT=('SHP', 'size'), LUP_AREA=('LUP_SHP', 'sum'))
+    for (aoi, au), au_name, total_area, total_count, lup_area in aoi_au_df.itertuples(name=None):
+        assess_unit = lup_ds.aoi[aoi].assessment_units[au]
+        assess_unit.au_name = au_name
+        assess_unit.total_area += float(total_area)
+        assess_unit.total_count += int(total_count)
+        assess_unit.aoi_area += float(lup_area)
+
+    # Keep the additional field values of the last record within the lup value for each assessment unit
+    if lst_additional:
+        lup_df = au_df.loc[au_df['IN_LUP']]
+        for au, dict_other in lup_df.groupby('AU', sort=False)['OTHER'].last().items():
+            overall_units[au].other_fields.update(dict_other)
+        lup_df = lup_df.loc[lup_df['AOI'].notna()]
+        for (aoi, au), dict_other in lup_df.groupby(['AOI', 'AU'], sort=False)['OTHER'].last().items():
+            lup_ds.aoi[aoi].assessment_units[au].other_fields.update(dict_other)
+
+    return lup_ds
+
+
+def process_lup_ds_worker(lup_ds: LU_Value, dict_params: dict) -> tuple:
+    """
+    FUNCTION
+
+    process_lup_ds_worker: Runs process_lup_ds within a worker process.  Each worker writes to its own scratch geodatabase as a file geodatabase cannot have its schema changed by more than one process at a time; the outputs are copied back into the output geodatabase by LUP_Overlaps.collect_worker_outputs once the workers finish.  The log messages are collected so they can be written out by the main process
+
+    Args:
+        lup_ds (LU_Value): lup value object to run the overlay on
+        dict_params (dict): keyword arguments for process_lup_ds other than the lup value and logger
+
+    Returns:
+        tuple: lup value object with the overlay results, list of (level, message) log records
+    """
+    scratch_gdb = os.path.join(os.path.dirname(dict_params['out_gdb']), f'lup_work_{os.getppid()}_{os.getpid()}.gdb')
+    if not arcpy.Exists(scratch_gdb):
+        arcpy.management.CreateFileGDB(out_folder_path=os.path.dirname(scratch_gdb), 
+                                       out_name=os.path.basename(scratch_gdb))
+    arcpy.env.overwriteOutput = True
+
+    logger = logging.getLogger(f'lup_worker_{os.getpid()}')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = BufferingHandler(capacity=sys.maxsize)
+    logger.handlers = [handler]
+
+    lup_ds = process_lup_ds(lup_ds=lup_ds, logger=logger, **dict(dict_params, work_path=scratch_gdb, out_gdb=scratch_gdb))
+
+    return lup_ds, [(record.levelno, record.getMessage()) for record in handler.buffer]
+
 
 # First line the script hits when run, passes control up to the run_app function
 if __name__ == '__main__':
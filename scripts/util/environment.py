@@ -9,6 +9,8 @@ from ctypes import wintypes
 from xml.etree import ElementTree as eT
 from datetime import datetime as dt
 
+# Running inside ArcGIS rather than a standalone python interpreter
+arc_env = os.path.basename(sys.executable).lower() != 'python.exe'
 
 
 class ArcPyLogHandler(logging.StreamHandler):
@@ -101,11 +103,6 @@ class Environment:
             except Exception as e:
                 logger.removeHandler(fh)
 
-        if os.path.basename(sys.executable).lower() == 'python.exe':
-            arc_env = False
-        else:
-            arc_env = True
-
         if arc_env:
             arc_handler = ArcPyLogHandler()
             arc_handler.setLevel(args.log_level)
@@ -179,11 +176,11 @@ class Environment:
             ------------------------------------------------------------------------------------------------------------
         """
         appdata = os.getenv('APPDATA')
-        arcgisVersion = arcpy.GetInstallInfo()['Version'][:-2] \
-            if arcpy.GetInstallInfo()['Version'].count('.') > 1 else arcpy.GetInstallInfo()['Version']
+        arcgisVersion = arcpy.GetInstallInfo()['Version']
+        if arcgisVersion.count('.') > 1:
+            arcgisVersion = arcgisVersion[:-2]
         arcCatalogPath = os.path.join(appdata, 'ESRI', u'Desktop' + arcgisVersion, 'ArcCatalog')
 
-        for f in os.listdir(arcCatalogPath):
-            fileIsSdeConnection = f.lower().endswith(".sde")
-            if fileIsSdeConnection and f == db_name:
-                return os.path.join(arcCatalogPath, f)
+        sdeConnectionPath = os.path.join(arcCatalogPath, db_name)
+        if db_name.lower().endswith(".sde") and os.path.isfile(sdeConnectionPath):
+            return sdeConnectionPath